@@ -2,19 +2,34 @@ from typing import Any, Text, Dict, List, Optional, Tuple
 from rasa_sdk import Action, Tracker, FormValidationAction
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.events import SlotSet, Restarted, FollowupAction
+import asyncio
 import json
 import os
 import sqlite3
-from datetime import datetime
+import threading
+from datetime import date, datetime, timezone
 import re
 from pathlib import Path
+from functools import lru_cache
+
+# orjson is an optional speed-up; stdlib json is the fallback
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
 
 # --- Allowed countries loader (unchanged) ---
 
+ALLOWED_COUNTRIES_JSON = Path(__file__).resolve().parent.parent / 'allowed_countries.json'
+
+# Called once, at import; the tables below are derived from it and fixed for the process
 def load_allowed_countries() -> Dict[str, str]:
-    json_path = os.path.join(os.path.dirname(__file__), '..', 'allowed_countries.json')
-    with open(json_path, 'r', encoding='utf-8') as f:
-        airports = json.load(f)
+    airports = _json_loads(ALLOWED_COUNTRIES_JSON.read_bytes())
 
     # Build a dict: City → IATA
     city_to_iata = {}
@@ -27,15 +42,32 @@ def load_allowed_countries() -> Dict[str, str]:
 
 CITY_TO_IATA = load_allowed_countries()
 ALLOWED_COUNTRIES = CITY_TO_IATA  # alias
-ALLOWED_COUNTRIES_SET = set(CITY_TO_IATA.keys())
+ALLOWED_COUNTRIES_SET = frozenset(CITY_TO_IATA)  # canonical names, fixed for the process
 
-def validate_country(country: str) -> bool:
-    """Return True if the user-provided city is allowed"""
-    return bool(country) and country.strip().title() in ALLOWED_COUNTRIES_SET
+# casefolded name -> canonical city, so any input casing resolves in one lookup
+_NORM_MAP = {city.casefold(): city for city in ALLOWED_COUNTRIES_SET}
+
+# Lengths of the casefolded keys: cheap early reject for gibberish input
+_NAME_LENGTHS = frozenset(len(key) for key in _NORM_MAP)
+
+@lru_cache(maxsize=4096)
+def _canonical_city(name: Optional[str]) -> Optional[str]:
+    """Return the canonical spelling of an allowed city, or None"""
+    if not name:
+        return None
+    key = name.strip()
+    # casefold() never changes the length of ASCII text, so the length test
+    # is only safe (and only applied) for ASCII input
+    if key.isascii() and len(key) not in _NAME_LENGTHS:
+        return None
+    return _NORM_MAP.get(key.casefold())
+
+# The allowed list never changes at runtime, so render it once
+_COUNTRIES_BULLETS = "\n".join([f"• {city}" for city in sorted(ALLOWED_COUNTRIES_SET)])
 
 def format_country_list() -> str:
     """Return a nicely formatted string of allowed cities"""
-    return "\n".join(f"• {city}" for city in sorted(ALLOWED_COUNTRIES_SET))
+    return _COUNTRIES_BULLETS
 
 # If you want to override via env, set FLIGHTS_DB=/path/to/flights.db
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -47,25 +79,54 @@ NEARBY_BY_IATA: Dict[str, List[str]] = {
     "ICN": ["GMP"], "GMP": ["ICN"], # Seoul metro example
 }
 
-def _city_to_iata(name: str) -> str:
-    """Map a city to its IATA; fallback to uppercased input."""
-    key = (name or "").strip().title()
-    return CITY_TO_IATA.get(key, (name or "").strip().upper())
-
-def _expand_iata_candidates(name: str) -> List[str]:
-    primary = _city_to_iata(name)
+def _expand_iata(primary: Optional[str]) -> Tuple[str, ...]:
+    """`primary` plus its nearby airports, de-duplicated in order."""
     if not primary:
-        return []
-    out = [primary] + NEARBY_BY_IATA.get(primary, [])
-    seen, result = set(), []
-    for c in out:
-        if c and c not in seen:
-            result.append(c); seen.add(c)
-    return result
+        return ()
+    return tuple(dict.fromkeys(c for c in (primary, *NEARBY_BY_IATA.get(primary, ())) if c))
+
+# Both tables are static, so every known city's candidates are built once
+_EXPANDED_IATA: Dict[str, Tuple[str, ...]] = {
+    city: _expand_iata(iata) for city, iata in CITY_TO_IATA.items()
+}
+
+def _expand_iata_candidates(name: str) -> Tuple[str, ...]:
+    city = _canonical_city(name)
+    if city is not None:
+        return _EXPANDED_IATA[city]
+    # Not a known city: treat the input as an IATA code
+    return _expand_iata((name or "").strip().upper())
 
 # Strict DD/MM/YYYY matcher
 _DDMMYYYY_RE = re.compile(r"^\d{2}/\d{2}/\d{4}$")
 
+def _parse_ddmmyyyy(s: str) -> Optional[date]:
+    """Strict DD/MM/YYYY -> date by slicing (no strptime); None if malformed or impossible."""
+    if len(s) != 10 or s[2] != "/" or s[5] != "/":
+        return None
+    dd, mm, yyyy = s[0:2], s[3:5], s[6:10]
+    if not (dd.isdigit() and mm.isdigit() and yyyy.isdigit()):
+        return None
+    try:
+        return date(int(yyyy), int(mm), int(dd))
+    except ValueError:
+        return None
+
+# Phone matchers: international (+15551234567) or loose digits/dashes/spaces
+_PHONE_INTL_RE  = re.compile(r"\+?[1-9]\d{7,14}")
+_PHONE_LOOSE_RE = re.compile(r"[0-9\-+ ]{7,15}")
+_EMAIL_RE       = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+def _is_valid_phone(value: Optional[str]) -> bool:
+    return bool(value) and bool(_PHONE_INTL_RE.fullmatch(value) or _PHONE_LOOSE_RE.fullmatch(value))
+
+# "from X to Y" / "X to Y" route phrases (the "from" prefix is optional)
+_FROM_TO_RE = re.compile(r"\s*(?:from\s+)?(.+?)\s+to\s+(.+?)\s*", re.IGNORECASE)  # used with fullmatch
+
+# Accepted values for the class / seat validators
+_CLASS_SET = frozenset({"economy", "business", "first"})
+_SEAT_SET  = frozenset({"window", "aisle", "middle"})
+
 # Small helper to render flight lines
 def _format_flights_message(rows: List[tuple], origin: str, destination: str, date_str: str) -> str:
     """
@@ -87,15 +148,73 @@ def _to_iso_from_ddmmyyyy(s: str) -> Optional[str]:
     s = s.strip()
     if _ISO_DATE_RE.match(s):
         return s
+    # Common case: the form always stores zero-padded DD/MM/YYYY
+    dt = _parse_ddmmyyyy(s)
+    if dt is not None:
+        return dt.isoformat()
     m = _SLASHED_RE.match(s)
     if m:
         d, mth, y = map(int, m.groups())
         try:
-            return datetime(y, mth, d).date().isoformat()
+            return date(y, mth, d).isoformat()
         except ValueError:
             return None
     return None
 
+# --- SQLite connection cache ---
+# One long-lived connection per (thread, database) so the page cache stays
+# warm and no connect/close happens per action. Connections are never shared
+# across threads; SQLite's own locking (WAL + busy timeout) handles writers.
+# The action server runs on asyncio, so actions hand their blocking DB calls
+# to asyncio.to_thread and each worker thread keeps its own warm connection.
+_conn_cache = threading.local()
+
+def _get_conn(path: str) -> sqlite3.Connection:
+    conns = getattr(_conn_cache, "conns", None)
+    if conns is None:
+        conns = _conn_cache.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        # Autocommit mode: write transactions are opened explicitly
+        conn = sqlite3.connect(path, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")      # ~20 MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")    # 256 MiB memory-mapped reads
+        conn.execute("PRAGMA foreign_keys=ON")
+        conns[path] = conn
+    return conn
+
+def _init_db(path: str) -> sqlite3.Connection:
+    """One-time setup at import: WAL lets lookups read while a booking commits."""
+    conn = _get_conn(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+try:
+    _init_db(FLIGHTS_DB_PATH)
+except sqlite3.Error as e:
+    print(f"[actions] Could not initialise flights DB: {e} (db={FLIGHTS_DB_PATH})")
+
+@lru_cache(maxsize=16)
+def _flight_sql(n_origin: int, n_dest: int) -> str:
+    """
+    Flight lookup SQL for the given IN-list sizes. Returning the identical
+    string each time also lets sqlite3's per-connection statement cache
+    reuse the prepared statement.
+    """
+    o_pl = ",".join("?" * n_origin)
+    d_pl = ",".join("?" * n_dest)
+    return f"""
+        SELECT flight_name, departure_time, arrival_time
+        FROM flights
+        WHERE travel_date = ?
+          AND origin IN ({o_pl})
+          AND destination IN ({d_pl})
+        ORDER BY (departure_time IS NULL), departure_time
+        LIMIT 5
+    """
+
 def _query_flights_for_date(origin: str, destination: str, travel_date: str) -> List[tuple]:
     """
     Returns rows: (flight_name, departure_time, arrival_time)
@@ -110,114 +229,226 @@ def _query_flights_for_date(origin: str, destination: str, travel_date: str) ->
     if not origin_codes or not dest_codes:
         return []
 
-    o_pl = ",".join("?" for _ in origin_codes)
-    d_pl = ",".join("?" for _ in dest_codes)
     params = [date_iso, *origin_codes, *dest_codes]
-
-    sql = f"""
-        SELECT flight_name, departure_time, arrival_time
-        FROM flights
-        WHERE travel_date = ?
-          AND origin IN ({o_pl})
-          AND destination IN ({d_pl})
-        ORDER BY (departure_time IS NULL), departure_time
-        LIMIT 5
-    """
+    sql = _flight_sql(len(origin_codes), len(dest_codes))
 
     try:
-        conn = sqlite3.connect(FLIGHTS_DB_PATH)
-        cur = conn.cursor()
-        cur.execute(sql, params)
-        rows = cur.fetchall()
+        rows = _get_conn(FLIGHTS_DB_PATH).execute(sql, params).fetchall()
         if not rows:
             print(f"[actions] 0 flights for date={date_iso} origin={origin_codes} dest={dest_codes}")
         return rows or []
     except Exception as e:
         print(f"[actions] DB query error: {e} (db={FLIGHTS_DB_PATH})")
         return []
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
 # --- DB helpers (BOOKINGS + PASSENGERS with per-passenger seat) ---
-DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'bookings.db')
+# Override with BOOKINGS_DB=/path/to/bookings.db (the tests point it at a temp file)
+DB_PATH = os.getenv("BOOKINGS_DB") or os.path.join(os.path.dirname(__file__), '..', 'bookings.db')
 
-def _ensure_db():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    try:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS bookings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                origin TEXT,
-                destination TEXT,
-                travel_date TEXT,
-                seat_preference TEXT,      -- (legacy/global; optional)
-                class_selection TEXT,
-                passenger_name TEXT,       -- primary contact
-                phone_number TEXT,         -- primary contact
-                travel_count INTEGER,
-                return_date TEXT,
-                created_at TEXT
-            )
-            """
+def _ensure_db(conn: sqlite3.Connection):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS bookings (
+            id INTEGER PRIMARY KEY,
+            origin TEXT,
+            destination TEXT,
+            travel_date TEXT,
+            seat_preference TEXT,      -- (legacy/global; optional)
+            class_selection TEXT,
+            passenger_name TEXT,       -- primary contact
+            phone_number TEXT,         -- primary contact
+            travel_count INTEGER,
+            return_date TEXT,
+            created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
         )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS passengers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                booking_id INTEGER,
-                name TEXT,
-                phone TEXT,
-                email TEXT,
-                seat_preference TEXT,      -- per-passenger seat
-                FOREIGN KEY(booking_id) REFERENCES bookings(id)
-            )
-            """
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS passengers (
+            id INTEGER PRIMARY KEY,
+            booking_id INTEGER,
+            name TEXT,
+            phone TEXT,
+            email TEXT,
+            seat_preference TEXT,      -- per-passenger seat
+            FOREIGN KEY(booking_id) REFERENCES bookings(id)
         )
-        conn.commit()
-    finally:
-        conn.close()
-
-def _save_booking(row: Dict[str, Any]) -> int:
-    _ensure_db()
-    conn = sqlite3.connect(DB_PATH)
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_bookings_route_date ON bookings(origin, destination, travel_date)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bookings_created ON bookings(created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_passengers_booking ON passengers(booking_id)")
+    conn.commit()
+
+def _ensure_phone_index(conn: sqlite3.Connection) -> bool:
+    """
+    Trigram FTS5 indexes over bookings.phone_number and passengers.phone,
+    kept in sync by triggers. Bookings only carry a contact phone in older
+    rows; new ones keep it per passenger. A B-tree index can't serve
+    LIKE '%q%'; the trigram tables can. Returns False when this SQLite
+    build lacks FTS5/trigram.
+    """
+    existed = {
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+            " AND name IN ('bookings_fts', 'passengers_fts')"
+        )
+    }
     try:
-        cur = conn.cursor()
-        cur.execute(
+        conn.executescript(
+            """
+            BEGIN;
+            CREATE VIRTUAL TABLE IF NOT EXISTS bookings_fts USING fts5(
+                phone_number,
+                content='bookings', content_rowid='id', tokenize='trigram'
+            );
+            CREATE TRIGGER IF NOT EXISTS bookings_fts_ai AFTER INSERT ON bookings BEGIN
+                INSERT INTO bookings_fts(rowid, phone_number) VALUES (new.id, new.phone_number);
+            END;
+            CREATE TRIGGER IF NOT EXISTS bookings_fts_ad AFTER DELETE ON bookings BEGIN
+                INSERT INTO bookings_fts(bookings_fts, rowid, phone_number)
+                VALUES ('delete', old.id, old.phone_number);
+            END;
+            CREATE TRIGGER IF NOT EXISTS bookings_fts_au AFTER UPDATE OF phone_number ON bookings BEGIN
+                INSERT INTO bookings_fts(bookings_fts, rowid, phone_number)
+                VALUES ('delete', old.id, old.phone_number);
+                INSERT INTO bookings_fts(rowid, phone_number) VALUES (new.id, new.phone_number);
+            END;
+            CREATE VIRTUAL TABLE IF NOT EXISTS passengers_fts USING fts5(
+                phone,
+                content='passengers', content_rowid='id', tokenize='trigram'
+            );
+            CREATE TRIGGER IF NOT EXISTS passengers_fts_ai AFTER INSERT ON passengers BEGIN
+                INSERT INTO passengers_fts(rowid, phone) VALUES (new.id, new.phone);
+            END;
+            CREATE TRIGGER IF NOT EXISTS passengers_fts_ad AFTER DELETE ON passengers BEGIN
+                INSERT INTO passengers_fts(passengers_fts, rowid, phone)
+                VALUES ('delete', old.id, old.phone);
+            END;
+            CREATE TRIGGER IF NOT EXISTS passengers_fts_au AFTER UPDATE OF phone ON passengers BEGIN
+                INSERT INTO passengers_fts(passengers_fts, rowid, phone)
+                VALUES ('delete', old.id, old.phone);
+                INSERT INTO passengers_fts(rowid, phone) VALUES (new.id, new.phone);
+            END;
+            COMMIT;
             """
-         INSERT INTO bookings
-            (origin, destination, travel_date,return_date, seat_preference, class_selection,
-            passenger_name, phone_number, travel_count, created_at)
-            VALUES (:origin, :destination, :travel_date, :flight_name, :flight_schedule_time, :return_date, :seat_preference, :class_selection,
-            :passenger_name, :phone_number, :travel_count, :created_at)
-            """,
-            {**row, "created_at": datetime.utcnow().isoformat()}
         )
-        booking_id = cur.lastrowid
-        conn.commit()
-        return booking_id
-    finally:
-        conn.close()
-
-def _save_passengers(booking_id: int, passengers: List[Dict[str, str]]):
+    except sqlite3.OperationalError as e:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        print(f"[actions] Phone lookup index unavailable, using LIKE scan: {e}")
+        return False
+    # Index the rows written before each table existed
+    for table in ("bookings_fts", "passengers_fts"):
+        if table not in existed:
+            conn.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+    return True
+
+# Writes stay on the request path on purpose: the confirmation message (and
+# later lookups) need the booking id from lastrowid. With WAL and
+# synchronous=NORMAL a commit only appends to the WAL without an fsync, so
+# there is no disk flush to hide behind a background writer.
+# A locked or unwritable bookings.db must not stop the actions from loading;
+# submit and lookup then report the DB error when they run.
+_HAS_PHONE_INDEX = False
+try:
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    _ensure_db(_init_db(DB_PATH))
+    _HAS_PHONE_INDEX = _ensure_phone_index(_get_conn(DB_PATH))
+except (OSError, sqlite3.Error) as e:
+    print(f"[actions] Could not initialise bookings DB: {e} (db={DB_PATH})")
+
+# Kept as module constants so sqlite3's statement cache always hits.
+# created_at is stamped by SQLite itself (UTC); it is spelled out in the
+# INSERT as well as the column default because tables created before the
+# default existed don't have one.
+_INSERT_BOOKING_SQL = """
+    INSERT INTO bookings
+    (origin, destination, travel_date, return_date, seat_preference, class_selection,
+    passenger_name, phone_number, travel_count, created_at)
+    VALUES (:origin, :destination, :travel_date, :return_date, :seat_preference, :class_selection,
+    :passenger_name, :phone_number, :travel_count, strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+"""
+_INSERT_PASSENGER_SQL = (
+    "INSERT INTO passengers (booking_id, name, phone, email, seat_preference) VALUES (?, ?, ?, ?, ?)"
+)
+
+def _save_passengers(conn: sqlite3.Connection, booking_id: int, passengers: List[Dict[str, str]]):
     if not passengers:
         return
-    conn = sqlite3.connect(DB_PATH)
-    try:
-        conn.executemany(
-            "INSERT INTO passengers (booking_id, name, phone, email, seat_preference) VALUES (?, ?, ?, ?, ?)",
-            [
-                (booking_id, p.get("name",""), p.get("phone",""), p.get("email",""), p.get("seat",""))
-                for p in passengers
-            ]
+    conn.executemany(
+        _INSERT_PASSENGER_SQL,
+        (
+            (booking_id, p.get("name",""), p.get("phone",""), p.get("email",""), p.get("seat",""))
+            for p in passengers
         )
-        conn.commit()
-    finally:
-        conn.close()
+    )
+
+def _save_booking(row: Dict[str, Any], passengers: List[Dict[str, str]]) -> int:
+    """Insert the booking and its passengers in one transaction (one commit)."""
+    conn = _get_conn(DB_PATH)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        booking_id = conn.execute(_INSERT_BOOKING_SQL, row).lastrowid
+        _save_passengers(conn, booking_id, passengers)
+        conn.execute("COMMIT")
+    except Exception:
+        # SQLite may already have rolled back (e.g. SQLITE_FULL/IOERR); a bare
+        # ROLLBACK would then raise and hide the original error
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    return booking_id
+
+# --- "passengers" slot (a JSON list kept in a text slot) ---
+
+def _load_pax(raw: Optional[str]) -> List[Dict[str, str]]:
+    """Decode the passengers slot; a missing or corrupt value yields []."""
+    try:
+        return _json_loads(raw or "[]")
+    except Exception:
+        return []
+
+def _dump_pax(passengers: List[Dict[str, str]]) -> str:
+    return _json_dumps(passengers)
+
+# Passenger entries in a bulk answer: one per line or separated by ";"
+_PAX_BULK_SPLIT_RE = re.compile(r"[;\n]+")
+
+def _parse_pax_bulk(text: str) -> Optional[List[List[str]]]:
+    """
+    Split a bulk answer into [name, phone, email, seat] entries.
+    None unless every entry has exactly those four comma-separated fields
+    and the first one's phone and email look valid, so a plain name that
+    happens to contain commas ("Smith, John, Jr., III") isn't taken as one.
+    """
+    if "," not in text:
+        return None
+    entries = [
+        [field.strip() for field in entry.split(",")]
+        for entry in _PAX_BULK_SPLIT_RE.split(text)
+        if entry.strip()
+    ]
+    if not entries or any(len(e) != 4 for e in entries):
+        return None
+    _, phone, email, _ = entries[0]
+    if not (_is_valid_phone(phone) and _EMAIL_RE.fullmatch(email)):
+        return None
+    return entries
+
+def _format_pax_lines(passengers: List[Dict[str, str]]) -> str:
+    """One numbered line per passenger for the confirmation message."""
+    get = dict.get  # bound once instead of a p.get attribute lookup per field
+    return "\n".join(
+        [
+            f"   {i}. {get(p, 'name', 'N/A')} | {get(p, 'phone', 'N/A')} | "
+            f"{get(p, 'email', 'N/A')} | Seat: {get(p, 'seat', 'N/A')}"
+            for i, p in enumerate(passengers, start=1)
+        ]
+    ) or "   (no additional passengers)"
 
 # ------------------- FORM VALIDATION -------------------
 
@@ -227,7 +458,8 @@ class ValidateFlightBookingForm(FormValidationAction):
         return "validate_flight_booking_form"
 
     def _normalize_country(self, value: Optional[Text]) -> Optional[Text]:
-        return value.strip().title() if value else value
+        """Canonical allowed-city name for `value`, or None if it isn't allowed."""
+        return _canonical_city(value)
 
     # >>> helper to parse "from X to Y" or "X to Y"
     def _parse_from_to(self, text: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
@@ -239,80 +471,53 @@ class ValidateFlightBookingForm(FormValidationAction):
         if not text:
             return None, None
 
-        s = text.strip()
-        m = re.match(r"^\s*from\s+(.+?)\s+to\s+(.+?)\s*$", s, flags=re.IGNORECASE)
-        if m:
-            o = m.group(1).strip().title()
-            d = m.group(2).strip().title()
-            return o, d
-
-        m2 = re.match(r"^\s*(.+?)\s+to\s+(.+?)\s*$", s, flags=re.IGNORECASE)
-        if m2:
-            o = m2.group(1).strip().title()
-            d = m2.group(2).strip().title()
-            return o, d
+        # Most answers are a single place name: skip the regex unless the
+        # text has a standalone "to" word for it to split on.
+        if "to" not in text.lower().split():
+            return None, None
 
-        return None, None
+        m = _FROM_TO_RE.fullmatch(text)
+        if not m:
+            return None, None
+        return m.group(1).strip(), m.group(2).strip()
 
     # ---------------------------
     # Origin / Destination
     # ---------------------------
 
-    def validate_origin(self, value, dispatcher, tracker, domain):
+    def _validate_place(self, slot: Text, value, dispatcher, tracker) -> Dict[Text, Any]:
+        """Shared body of validate_origin / validate_destination."""
+        other = "destination" if slot == "origin" else "origin"
+
         o, d = self._parse_from_to(value)
-        if o and d and validate_country(o) and validate_country(d):
+        o, d = self._normalize_country(o), self._normalize_country(d)
+        if o and d:
             if o == d:
                 dispatcher.utter_message(text="Origin and destination cannot be the same. Please choose different places.")
-                return {"origin": None}
+                return {slot: None}
             dispatcher.utter_message(text=f"Got it ✅ Origin: {o}, Destination: {d}.")
             return {"origin": o, "destination": d}
 
-        norm = self._normalize_country(value)
-        if validate_country(norm):
-            dest = tracker.get_slot("destination")
-            if dest and norm == self._normalize_country(dest):
-                dispatcher.utter_message(text="Origin and destination cannot be the same. Please choose a different origin.")
-                return {"origin": None}
-            return {"origin": norm}
+        # "X to <destination>" where only the destination part is usable
+        norm = d if slot == "destination" and d else self._normalize_country(value)
+        if norm:
+            # The other slot only ever holds a value this method produced, so
+            # it is already canonical and needs no second normalisation.
+            if norm == tracker.get_slot(other):
+                dispatcher.utter_message(text=f"Origin and destination cannot be the same. Please choose a different {slot}.")
+                return {slot: None}
+            return {slot: norm}
 
         dispatcher.utter_message(
-            text=f"Sorry, '{value}' is not supported.\nChoose origin from:\n{format_country_list()}"
+            text=f"Sorry, '{value}' is not supported.\nChoose {slot} from:\n{format_country_list()}"
         )
-        return {"origin": None}
-
-    def validate_destination(self, value, dispatcher, tracker, domain):
-        o, d = self._parse_from_to(value)
-        if o and d and validate_country(o) and validate_country(d):
-            if o == d:
-                dispatcher.utter_message(text="Origin and destination cannot be the same. Please choose different places.")
-                return {"destination": None}
-            dispatcher.utter_message(text=f"Got it ✅ Origin: {o}, Destination: {d}.")
-            return {"origin": o, "destination": d}
+        return {slot: None}
 
-        if not d:
-            norm = self._normalize_country(value)
-            if validate_country(norm):
-                origin = tracker.get_slot("origin")
-                if origin and norm == self._normalize_country(origin):
-                    dispatcher.utter_message(text="Origin and destination cannot be the same. Please choose a different destination.")
-                    return {"destination": None}
-                return {"destination": norm}
-            dispatcher.utter_message(
-                text=f"Sorry, '{value}' is not supported.\nChoose destination from:\n{format_country_list()}"
-            )
-            return {"destination": None}
-
-        if validate_country(d):
-            origin = tracker.get_slot("origin")
-            if origin and self._normalize_country(origin) == d:
-                dispatcher.utter_message(text="Origin and destination cannot be the same. Please choose a different destination.")
-                return {"destination": None}
-            return {"destination": d}
+    def validate_origin(self, value, dispatcher, tracker, domain):
+        return self._validate_place("origin", value, dispatcher, tracker)
 
-        dispatcher.utter_message(
-            text=f"Sorry, '{value}' is not supported.\nChoose destination from:\n{format_country_list()}"
-        )
-        return {"destination": None}
+    def validate_destination(self, value, dispatcher, tracker, domain):
+        return self._validate_place("destination", value, dispatcher, tracker)
 
     # ---------------------------
     # Travel date (simple only)
@@ -323,38 +528,40 @@ class ValidateFlightBookingForm(FormValidationAction):
             return []
         return domain_slots
 
-    def validate_travel_date(self, value, dispatcher, tracker, domain):
-        # Must be DD/MM/YYYY
-        if not _DDMMYYYY_RE.match(value or ""):
-            dispatcher.utter_message(text="❌ Please enter the date in DD/MM/YYYY format (e.g., 15/09/2025).")
-            return {"travel_date": None}
+    async def validate_travel_date(self, value, dispatcher, tracker, domain):
+        # Must be DD/MM/YYYY; the regex only runs on failure to pick the
+        # right error message.
+        value = (value or "").strip()
+        dt = _parse_ddmmyyyy(value)
+        if dt is None:
+            if _DDMMYYYY_RE.match(value):
+                dispatcher.utter_message(text="❌ Invalid date. Please check the day, month, and year.")
+            else:
+                dispatcher.utter_message(text="❌ Please enter the date in DD/MM/YYYY format (e.g., 15/09/2025).")
+            return {"travel_date": None, "travel_date_iso": None}
 
         # No past dates
-        try:
-            dt = datetime.strptime(value, "%d/%m/%Y").date()
-        except ValueError:
-            dispatcher.utter_message(text="❌ Invalid date. Please check the day, month, and year.")
-            return {"travel_date": None}
-
-        if dt < datetime.utcnow().date():
+        if dt < datetime.now(timezone.utc).date():
             dispatcher.utter_message(text="⚠️ Past dates aren’t allowed. Please choose a future date.")
-            return {"travel_date": None}
+            return {"travel_date": None, "travel_date_iso": None}
 
+        date_iso = dt.isoformat()
         origin = tracker.get_slot("origin")
         destination = tracker.get_slot("destination")
 
         # If places aren’t set yet, just store date
         if not origin or not destination:
-            return {"travel_date": value}
+            return {"travel_date": value, "travel_date_iso": date_iso}
 
-        # Check DB
-        rows = _query_flights_for_date(origin, destination, value)
+        # Check DB (pass the already-parsed date so it isn't parsed again)
+        rows = await asyncio.to_thread(_query_flights_for_date, origin, destination, date_iso)
         print(f"[validate_travel_date] origin={origin!r} dest={destination!r} date={value!r} rows_found={len(rows)}")
 
         if not rows:
             # Mark to end form; submit will handle apology/restart
             return {
                 "travel_date": value,
+                "travel_date_iso": date_iso,
                 "no_flights": True,
             }
 
@@ -362,30 +569,36 @@ class ValidateFlightBookingForm(FormValidationAction):
         dispatcher.utter_message(text=_format_flights_message(rows, origin, destination, value))
         return {
             "travel_date": value,
+            "travel_date_iso": date_iso,
             "no_flights": False,
         }
 
 
     def validate_class_selection(self, value, dispatcher, tracker, domain):
-        v = (value or "").lower().strip()
-        if v in {"economy", "business", "first"}:
+        v = (value or "").strip().casefold()
+        if v in _CLASS_SET:
             return {"class_selection": v}
         dispatcher.utter_message(text="Please choose a class: economy, business, or first.")
         return {"class_selection": None}
 
     def validate_return_date(self, value, dispatcher, tracker, domain):
-        pattern = r"^\d{2}/\d{2}/\d{4}$"
-        if not re.match(pattern, value or ""):
+        value = (value or "").strip()
+        if not _DDMMYYYY_RE.match(value):
             dispatcher.utter_message(text="❌ Please enter the date in DD/MM/YYYY format (e.g., 15/09/2025).")
             return {"return_date": None}
-        try:
-            dep = tracker.get_slot("travel_date")
-            dep_dt = datetime.strptime(dep, "%d/%m/%Y").date() if dep else None
-            ret_dt = datetime.strptime(value, "%d/%m/%Y").date()
-        except ValueError:
+        # validate_travel_date stores the parsed departure as ISO; fall back
+        # to the DD/MM/YYYY slot for conversations started before it did
+        dep_iso = tracker.get_slot("travel_date_iso")
+        dep = tracker.get_slot("travel_date")
+        if dep_iso:
+            dep_dt = date.fromisoformat(dep_iso)
+        else:
+            dep_dt = _parse_ddmmyyyy(dep) if dep else None
+        ret_dt = _parse_ddmmyyyy(value)
+        if ret_dt is None or (dep and dep_dt is None):
             dispatcher.utter_message(text="❌ Invalid date. Please check the day, month, and year.")
             return {"return_date": None}
-        today = datetime.utcnow().date()
+        today = datetime.now(timezone.utc).date()
         if ret_dt < today:
             dispatcher.utter_message(text="❌ Return date cannot be in the past. Please choose a future date.")
             return {"return_date": None}
@@ -395,52 +608,110 @@ class ValidateFlightBookingForm(FormValidationAction):
         return {"return_date": value}
 
     def validate_passenger_name(self, value, dispatcher, tracker, domain):
-        if value and value.strip():
-            return {"passenger_name": value.strip()}
+        name = (value or "").strip()
+        if name:
+            return {"passenger_name": name}
         dispatcher.utter_message(text="Please enter the main passenger's name.")
         return {"passenger_name": None}
 
     def validate_travel_count(self, value, dispatcher, tracker, domain):
-        if value and str(value).strip().isdigit():
-            n = int(str(value).strip())
-            if n >= 1:
-                return {
-                    "travel_count": n,
-                    "expected_passengers": n,
-                    "current_passenger_index": 1,
-                    "passengers": json.dumps([]),
-                    "current_passenger_name": None,
-                    "current_passenger_phone": None,
-                    "current_passenger_email": None,
-                    "current_passenger_seat_preference": None,
-                }
+        try:
+            n = int(value)
+        except (TypeError, ValueError):
+            n = 0
+        if n >= 1:
+            return {
+                "travel_count": n,
+                "expected_passengers": n,
+                "current_passenger_index": 1,
+                "passengers": _dump_pax([]),
+                "current_passenger_name": None,
+                "current_passenger_phone": None,
+                "current_passenger_email": None,
+                "current_passenger_seat_preference": None,
+            }
         dispatcher.utter_message(text="Please enter a valid number of travelers (e.g., 1, 2, 3).")
         return {"travel_count": None}
 
+    def _validate_pax_bulk(self, entries, dispatcher, tracker) -> Dict[Text, Any]:
+        """Validate and store one or more of the remaining passengers from one answer."""
+        idx = int(tracker.get_slot("current_passenger_index") or 1)
+        expected = int(tracker.get_slot("expected_passengers") or 1)
+        remaining = expected - idx + 1
+        if len(entries) > remaining:
+            dispatcher.utter_message(
+                text=f"Please send at most {remaining} passenger(s), one per line: name, phone, email, seat."
+            )
+            return {"current_passenger_name": None}
+
+        added = []
+        for n, (name, phone, email, seat) in enumerate(entries, start=idx):
+            seat = seat.casefold()
+            if not (name and _is_valid_phone(phone) and _EMAIL_RE.fullmatch(email) and seat in _SEAT_SET):
+                dispatcher.utter_message(
+                    text=f"Passenger {n}'s details look invalid. Use: name, phone, email, seat (window, aisle, or middle)."
+                )
+                return {"current_passenger_name": None}
+            added.append({"name": name, "phone": phone, "email": email, "seat": seat})
+
+        passengers = _dump_pax(_load_pax(tracker.get_slot("passengers")) + added)
+        if len(added) < remaining:
+            # Some passengers still to go: ask for the next one as the seat
+            # validator does
+            next_idx = idx + len(added)
+            dispatcher.utter_message(text=f"Got it ✅. Now, please provide details for passenger {next_idx}.")
+            return {
+                "passengers": passengers,
+                "current_passenger_index": next_idx,
+                "current_passenger_name": None,
+                "current_passenger_phone": None,
+                "current_passenger_email": None,
+                "current_passenger_seat_preference": None,
+            }
+
+        # One slot write for the whole list; the last passenger's fields fill
+        # the per-passenger slots so the form can complete this turn
+        last = added[-1]
+        return {
+            "passengers": passengers,
+            "current_passenger_index": expected,
+            "current_passenger_name": last["name"],
+            "current_passenger_phone": last["phone"],
+            "current_passenger_email": last["email"],
+            "current_passenger_seat_preference": last["seat"],
+        }
+
     def validate_current_passenger_name(self, value, dispatcher, tracker, domain):
-        if value and value.strip():
-            return {"current_passenger_name": value.strip()}
+        # "name, phone, email, seat" per line: all remaining passengers at once
+        entries = _parse_pax_bulk(value or "")
+        if entries is not None:
+            return self._validate_pax_bulk(entries, dispatcher, tracker)
+
+        name = (value or "").strip()
+        if name:
+            return {"current_passenger_name": name}
         idx = tracker.get_slot("current_passenger_index") or 1
         dispatcher.utter_message(text=f"Please enter passenger {idx}'s full name.")
         return {"current_passenger_name": None}
 
     def validate_current_passenger_phone(self, value, dispatcher, tracker, domain):
-        if value and (re.fullmatch(r"\+?[1-9]\d{7,14}", value) or re.fullmatch(r"[0-9\-+ ]{7,15}", value)):
+        if _is_valid_phone(value):
             return {"current_passenger_phone": value}
         idx = tracker.get_slot("current_passenger_index") or 1
         dispatcher.utter_message(text=f"Please enter a valid phone number for passenger {idx} (e.g., +15551234567).")
         return {"current_passenger_phone": None}
 
     def validate_current_passenger_email(self, value, dispatcher, tracker, domain):
-        if value and re.fullmatch(r"[^@\s]+@[^@\s]+\.[^@\s]+", value.strip()):
-            return {"current_passenger_email": value.strip()}
+        email = (value or "").strip()
+        if _EMAIL_RE.fullmatch(email):
+            return {"current_passenger_email": email}
         idx = tracker.get_slot("current_passenger_index") or 1
         dispatcher.utter_message(text=f"Please enter a valid email for passenger {idx} (e.g., name@example.com).")
         return {"current_passenger_email": None}
 
     def validate_current_passenger_seat_preference(self, value, dispatcher, tracker, domain):
-        v = (value or "").lower().strip()
-        if v in {"window", "aisle", "middle"}:
+        v = (value or "").strip().casefold()
+        if v in _SEAT_SET:
             # Collect all current passenger fields
             name  = tracker.get_slot("current_passenger_name")
             phone = tracker.get_slot("current_passenger_phone")
@@ -449,11 +720,7 @@ class ValidateFlightBookingForm(FormValidationAction):
             expected = int(tracker.get_slot("expected_passengers") or 1)
 
             # Load current list
-            passengers_json = tracker.get_slot("passengers") or "[]"
-            try:
-                passengers: List[Dict[str, str]] = json.loads(passengers_json)
-            except Exception:
-                passengers = []
+            passengers = _load_pax(tracker.get_slot("passengers"))
 
             # Append this passenger (all 4 fields present now)
             if all([name, phone, email, v]):
@@ -464,7 +731,7 @@ class ValidateFlightBookingForm(FormValidationAction):
                 next_idx = idx + 1
                 dispatcher.utter_message(text=f"Got it ✅. Now, please provide details for passenger {next_idx}.")
                 return {
-                    "passengers": json.dumps(passengers),
+                    "passengers": _dump_pax(passengers),
                     "current_passenger_index": next_idx,
                     # clear fields for the next passenger
                     "current_passenger_name": None,
@@ -475,7 +742,7 @@ class ValidateFlightBookingForm(FormValidationAction):
 
             # Done collecting; keep seat set so the form can complete
             return {
-                "passengers": json.dumps(passengers),
+                "passengers": _dump_pax(passengers),
                 "current_passenger_seat_preference": v,
             }
 
@@ -510,77 +777,90 @@ def _get_table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
     cur.execute(f"PRAGMA table_info({table})")
     return [row[1] for row in cur.fetchall()]
 
-def _row_to_dict(row: tuple, cols: List[str]) -> Dict[str, Any]:
-    return {col: row[i] for i, col in enumerate(cols)}
+# Older bookings.db files may lack some passenger columns, so the lookup
+# selects only the ones present. The schema is fixed for the process
+# lifetime, so this is resolved (and the SQL built) once at import. If the
+# DB can't be read here, assume the columns _ensure_db creates.
+_PAX_COLS = ["name", "phone", "email", "seat_preference"]
+try:
+    _existing = _get_table_columns(_get_conn(DB_PATH), "passengers")
+    if _existing:
+        _PAX_COLS = [c for c in _PAX_COLS if c in _existing]
+except sqlite3.Error as e:
+    print(f"[actions] Could not read passengers columns: {e} (db={DB_PATH})")
+
+# One round-trip: pick the booking (an exact id match wins over a phone
+# match), then LEFT JOIN its passengers. Passenger columns are prefixed
+# because bookings has its own seat_preference. A phone matches either the
+# booking's contact number (older rows) or any of its passengers' phones,
+# which is where new bookings keep them. The match goes through the trigram
+# tables when there are any: LIKE on them is answered from the index and
+# keeps the plain substring semantics (even for queries under 3 chars).
+if _HAS_PHONE_INDEX:
+    _PHONE_MATCH_SQL = """
+        SELECT rowid AS id FROM bookings_fts WHERE phone_number LIKE :phone
+        UNION ALL
+        SELECT p.booking_id FROM passengers_fts f JOIN passengers p ON p.id = f.rowid
+        WHERE f.phone LIKE :phone
+    """
+else:
+    _PHONE_MATCH_SQL = "SELECT id FROM bookings WHERE phone_number LIKE :phone"
+    if "phone" in _PAX_COLS:
+        _PHONE_MATCH_SQL += " UNION ALL SELECT booking_id FROM passengers WHERE phone LIKE :phone"
+_LOOKUP_SQL = f"""
+    SELECT b.*, p.id AS pax_id{"".join(f", p.{c} AS pax_{c}" for c in _PAX_COLS)}
+    FROM bookings b
+    LEFT JOIN passengers p ON p.booking_id = b.id
+    WHERE b.id = (
+        SELECT id FROM (
+            SELECT id, 0 AS rank FROM bookings WHERE id = :bid
+            UNION ALL
+            SELECT id, 1 FROM ({_PHONE_MATCH_SQL})
+        )
+        ORDER BY rank, id
+        LIMIT 1
+    )
+    ORDER BY p.id
+"""
+
+def _lookup_booking_rows(bid: Optional[int], query: str) -> List[sqlite3.Row]:
+    cur = _get_conn(DB_PATH).cursor()
+    cur.row_factory = sqlite3.Row
+    return cur.execute(_LOOKUP_SQL, {"bid": bid, "phone": f"%{query}%"}).fetchall()
 
 class ActionLookupBooking(Action):
     """Looks up a booking by booking ID (int) or phone number (partial match)."""
     def name(self) -> Text:
         return "action_lookup_booking"
 
-    def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]) -> List[Dict]:
+    async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]) -> List[Dict]:
         query = (tracker.latest_message.get("text") or "").strip()
         if not query:
             dispatcher.utter_message(text="Please provide a booking ID or phone number.")
             return []
 
         try:
-            conn = sqlite3.connect(DB_PATH)
-        except Exception as e:
-            dispatcher.utter_message(text=f"⚠️ Could not open database: {e}")
-            return []
+            bid = int(query)
+        except ValueError:
+            bid = None
 
         try:
-            bcols = _get_table_columns(conn, "bookings")
-            pcols = _get_table_columns(conn, "passengers")
-            cur = conn.cursor()
-
-            # Try booking id
-            booking_row = None
-            try:
-                bid = int(query)
-                if "id" in bcols:
-                    cur.execute(f"SELECT {', '.join(bcols)} FROM bookings WHERE id = ?", (bid,))
-                    row = cur.fetchone()
-                    if row:
-                        booking_row = _row_to_dict(row, bcols)
-            except Exception:
-                pass
-
-            # Fallback: phone partial match
-            if not booking_row and "phone_number" in bcols:
-                cur.execute(
-                    f"SELECT {', '.join(bcols)} FROM bookings WHERE phone_number LIKE ?",
-                    (f"%{query}%",)
-                )
-                row = cur.fetchone()
-                if row:
-                    booking_row = _row_to_dict(row, bcols)
+            rows = await asyncio.to_thread(_lookup_booking_rows, bid, query)
 
-            if not booking_row:
+            if not rows:
                 dispatcher.utter_message(text="Sorry, I couldn't find a booking with that information.")
                 return []
 
-            # Fetch passengers
-            pax_lines = "   (no additional passengers)"
-            if "id" in booking_row:
-                cols_to_select = [c for c in ["name", "phone", "email", "seat_preference"] if c in pcols]
-                if cols_to_select:
-                    cur.execute(
-                        f"SELECT {', '.join(cols_to_select)} FROM passengers WHERE booking_id = ?",
-                        (booking_row["id"],)
-                    )
-                    fetched = cur.fetchall()
-                    if fetched:
-                        idx = {c: i for i, c in enumerate(cols_to_select)}
-                        lines = []
-                        for r in fetched:
-                            name  = r[idx["name"]]  if "name"  in idx else "N/A"
-                            phone = r[idx["phone"]] if "phone" in idx else "N/A"
-                            email = r[idx["email"]] if "email" in idx else "N/A"
-                            seat  = r[idx["seat_preference"]] if "seat_preference" in idx else "(no seat)"
-                            lines.append(f"   - {name} | {phone} | {email} | Seat: {seat}")
-                        pax_lines = "\n".join(lines)
+            booking_row = dict(rows[0])
+
+            pax_lines = "\n".join(
+                [
+                    f"   - {r.get('pax_name', 'N/A')} | {r.get('pax_phone', 'N/A')} | "
+                    f"{r.get('pax_email', 'N/A')} | Seat: {r.get('pax_seat_preference', '(no seat)')}"
+                    for r in map(dict, rows)
+                    if r["pax_id"] is not None
+                ]
+            ) or "   (no additional passengers)"
 
             g = lambda k, d="N/A": booking_row.get(k, d)
 
@@ -599,22 +879,57 @@ class ActionLookupBooking(Action):
         except Exception as e:
             dispatcher.utter_message(text=f"⚠️ Lookup failed: {e}")
             return []
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+
+# Clear ONLY the slots that exist in your domain. The events are constant,
+# so build them once and hand out a copy per booking.
+_RESET_SLOT_EVENTS = tuple(
+    SlotSet(slot, None)
+    for slot in (
+        "origin",
+        "destination",
+        "travel_date",
+        "travel_date_iso",
+        "return_date",
+        "class_selection",
+        "passenger_name",
+        "travel_count",
+        "expected_passengers",
+        "current_passenger_index",
+        "current_passenger_name",
+        "current_passenger_phone",
+        "current_passenger_email",
+        "current_passenger_seat_preference",
+        "passengers",
+        "no_flights",
+    )
+)
+
+# Parsed once; filled per booking from the row dict via format_map
+_CONFIRM_TMPL = (
+    "✅ Booking Confirmed!\n\n"
+    "📍 From → To: {origin} → {destination}\n"
+    "📅 Date: {travel_date} → {return_date}\n"
+    "🎫 Class: {class_selection}\n"
+    "👤 Primary Contact: {passenger_name}\n"
+    "👥 Travelers: {travel_count}\n"
+    "🪑 Seats: per passenger below\n"
+    "📜 Passenger List:\n{pax_lines}\n\n"
+    "{saved_msg}"
+)
 
 class ActionSubmitBooking(Action):
     def name(self) -> str:
         return "action_submit_booking"
 
-    def run(self, dispatcher, tracker, domain):
+    async def run(self, dispatcher, tracker, domain):
+        # One dict fetch instead of a get_slot() call per slot
+        slots = tracker.slots
+
         # If you’re using no_flights logic elsewhere, handle it gracefully
-        if tracker.get_slot("no_flights"):
-            origin = tracker.get_slot("origin") or "N/A"
-            destination = tracker.get_slot("destination") or "N/A"
-            travel_date = tracker.get_slot("travel_date") or "N/A"
+        if slots.get("no_flights"):
+            origin = slots.get("origin") or "N/A"
+            destination = slots.get("destination") or "N/A"
+            travel_date = slots.get("travel_date") or "N/A"
             dispatcher.utter_message(
                 text=f"😔 Sorry, no flights for {origin} → {destination} on {travel_date}. "
                      f"Please change your travel date or destination and try again."
@@ -625,70 +940,32 @@ class ActionSubmitBooking(Action):
         # Build the DB row with only the columns your schema needs.
         # (flight_name / flight_schedule_time removed since you don’t keep those slots.)
         row = {
-            "origin": tracker.get_slot("origin") or "N/A",
-            "destination": tracker.get_slot("destination") or "N/A",
-            "travel_date": tracker.get_slot("travel_date") or "N/A",
-            "return_date": tracker.get_slot("return_date") or "N/A",
+            "origin": slots.get("origin") or "N/A",
+            "destination": slots.get("destination") or "N/A",
+            "travel_date": slots.get("travel_date") or "N/A",
+            "return_date": slots.get("return_date") or "N/A",
             "seat_preference": "N/A",
-            "class_selection": tracker.get_slot("class_selection") or "N/A",
-            "passenger_name": tracker.get_slot("passenger_name") or "N/A",
+            "class_selection": slots.get("class_selection") or "N/A",
+            "passenger_name": slots.get("passenger_name") or "N/A",
             "phone_number": "N/A",
-            "travel_count": tracker.get_slot("travel_count") or 1,
+            "travel_count": slots.get("travel_count") or 1,
         }
 
-        passengers_json = tracker.get_slot("passengers") or "[]"
-        try:
-            passengers = json.loads(passengers_json)
-        except Exception:
-            passengers = []
+        passengers = _load_pax(slots.get("passengers"))
 
         try:
-            booking_id = _save_booking(row)
-            _save_passengers(booking_id, passengers)
+            booking_id = await asyncio.to_thread(_save_booking, row, passengers)
             saved_msg = f"💾 Booking #{booking_id} saved with {len(passengers)} passenger(s)."
         except Exception as e:
             saved_msg = f"⚠️ Could not save booking to database: {e}"
 
-        pax_lines = "\n".join(
-            [
-                f"   {i+1}. {p.get('name','N/A')} | {p.get('phone','N/A')} | "
-                f"{p.get('email','N/A')} | Seat: {p.get('seat','N/A')}"
-                for i, p in enumerate(passengers)
-            ]
-        ) or "   (no additional passengers)"
+        pax_lines = _format_pax_lines(passengers)
 
         dispatcher.utter_message(
-            text=(
-                f"✅ Booking Confirmed!\n\n"
-                f"📍 From → To: {row['origin']} → {row['destination']}\n"
-                f"📅 Date: {row['travel_date']} → {row['return_date']}\n"
-                f"🎫 Class: {row['class_selection']}\n"
-                f"👤 Primary Contact: {row['passenger_name']}\n"
-                f"👥 Travelers: {row['travel_count']}\n"
-                f"🪑 Seats: per passenger below\n"
-                f"📜 Passenger List:\n{pax_lines}\n\n"
-                f"{saved_msg}"
-            )
+            text=_CONFIRM_TMPL.format_map({**row, "pax_lines": pax_lines, "saved_msg": saved_msg})
         )
 
-        # Clear ONLY the slots that exist in your domain
-        return [
-            SlotSet("origin", None),
-            SlotSet("destination", None),
-            SlotSet("travel_date", None),
-            SlotSet("return_date", None),
-            SlotSet("class_selection", None),
-            SlotSet("passenger_name", None),
-            SlotSet("travel_count", None),
-            SlotSet("expected_passengers", None),
-            SlotSet("current_passenger_index", None),
-            SlotSet("current_passenger_name", None),
-            SlotSet("current_passenger_phone", None),
-            SlotSet("current_passenger_email", None),
-            SlotSet("current_passenger_seat_preference", None),
-            SlotSet("passengers", None),
-            SlotSet("no_flights", None),
-        ]
+        return list(_RESET_SLOT_EVENTS)
 
 
 class ActionCache(Action):
@@ -1,13 +1,30 @@
 import json
 import sqlite3
 import re
-from pathlib import Path
-from datetime import datetime, date
+from types import MappingProxyType
+from datetime import datetime, date, timezone
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Iterator
+
+# ijson streams the "data" array item by item; without it the whole file
+# is decoded in one go (fine for small feeds)
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# orjson is an optional speed-up for that whole-file decode
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 DB_PATH = "flights.db"
 JSON_PATH = "flight_data.json"
 
-SCHEMA = """
+CREATE_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS flights (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
   flight_name     TEXT NOT NULL,
@@ -16,21 +33,49 @@ CREATE TABLE IF NOT EXISTS flights (
   destination     TEXT NOT NULL,      -- IATA (e.g., BER)
   departure_time  TEXT,               -- ISO8601 or NULL
   arrival_time    TEXT,               -- ISO8601 or NULL
+  departure_epoch INTEGER,            -- departure_time as unix seconds (UTC)
+  arrival_epoch   INTEGER,            -- arrival_time as unix seconds (UTC)
   UNIQUE (flight_name, travel_date, departure_time) ON CONFLICT IGNORE
 );
+"""
+
+# Added to flights tables created before the epoch columns existed; the
+# backfill uses SQLite's own parser, which understands the same ISO8601 forms
+EPOCH_COLUMNS = {
+    "departure_epoch": "departure_time",
+    "arrival_epoch": "arrival_time",
+}
+
+# Built after the bulk load so inserts only maintain the UNIQUE index
+CREATE_INDEXES_SQL = """
 CREATE INDEX IF NOT EXISTS idx_flights_route_date ON flights(origin, destination, travel_date);
 CREATE INDEX IF NOT EXISTS idx_flights_date       ON flights(travel_date);
 """
 
+# Bulk-load settings: WAL (the actions server also opens flights.db in WAL),
+# no fsync per commit, temp B-trees in memory and a 64 MiB page cache
+PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+"""
+
 # ---- Date normalization (only change you asked for) ----
 # Change this if you want to store in a different string format
 OUTPUT_DATE_FMT = "%Y-%m-%d"
 
-_ISO_DATE_RE     = re.compile(r"^\d{4}-\d{2}-\d{2}$")
-_SLASHED_RE      = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")   # DD/MM/YYYY or MM/DD/YYYY
-_DASHED_DMY_RE   = re.compile(r"^(\d{1,2})-(\d{1,2})-(\d{4})$")   # DD-MM-YYYY
-_YMD_SLASH_RE    = re.compile(r"^(\d{4})/(\d{1,2})/(\d{1,2})$")   # YYYY/MM/DD
+# All date-only spellings in one pattern; the named group that matched
+# says which one it was, and its three unnamed sub-groups follow it
+_DATE_RE = re.compile(
+    r"(?P<iso>\d{4}-\d{2}-\d{2})"
+    r"|(?P<slashed>(\d{1,2})/(\d{1,2})/(\d{4}))"   # DD/MM/YYYY or MM/DD/YYYY
+    r"|(?P<dashed>(\d{1,2})-(\d{1,2})-(\d{4}))"    # DD-MM-YYYY
+    r"|(?P<ymd>(\d{4})/(\d{1,2})/(\d{1,2}))"       # YYYY/MM/DD
+)
 
+# A feed repeats the same few flight dates, so parse each distinct string once
+@lru_cache(maxsize=4096)
 def iso_date(s: str | None, *, output_fmt: str = OUTPUT_DATE_FMT, day_first: bool = True) -> str | None:
     """
     Normalize various date strings to `output_fmt` (default YYYY-MM-DD).
@@ -46,25 +91,29 @@ def iso_date(s: str | None, *, output_fmt: str = OUTPUT_DATE_FMT, day_first: boo
         return None
     s = s.strip()
 
+    m = _DATE_RE.fullmatch(s)
+    if m is None:
+        # ISO datetime (accept 'Z')
+        if "T" in s:
+            try:
+                zfixed = s.replace("Z", "+00:00")
+                return datetime.fromisoformat(zfixed).date().strftime(output_fmt)
+            except ValueError:
+                pass
+        return None
+
+    kind = m.lastgroup
+
     # Pure ISO date
-    if _ISO_DATE_RE.match(s):
+    if kind == "iso":
         try:
-            return datetime.strptime(s, "%Y-%m-%d").strftime(output_fmt)
+            d = date.fromisoformat(s)  # still rejects impossible dates
         except ValueError:
             return None
+        return s if output_fmt == "%Y-%m-%d" else d.strftime(output_fmt)
 
-    # ISO datetime (accept 'Z')
-    if "T" in s:
-        try:
-            zfixed = s.replace("Z", "+00:00")
-            return datetime.fromisoformat(zfixed).date().strftime(output_fmt)
-        except ValueError:
-            pass
-
-    # DD/MM/YYYY or MM/DD/YYYY
-    m = _SLASHED_RE.match(s)
-    if m:
-        a, b, y = map(int, m.groups())
+    a, b, c = map(int, m.groups()[m.lastindex:m.lastindex + 3])
+    if kind == "slashed":
         if a > 12 and b <= 12:
             day, month = a, b
         elif b > 12 and a <= 12:
@@ -72,83 +121,134 @@ def iso_date(s: str | None, *, output_fmt: str = OUTPUT_DATE_FMT, day_first: boo
         else:
             # ambiguous -> choose based on preference
             day, month = (a, b) if day_first else (b, a)
-        try:
-            return date(y, month, day).strftime(output_fmt)
-        except ValueError:
-            return None
+        year = c
+    elif kind == "dashed":
+        day, month, year = a, b, c
+    else:  # ymd
+        year, month, day = a, b, c
 
-    # DD-MM-YYYY
-    m = _DASHED_DMY_RE.match(s)
-    if m:
-        d, mth, y = map(int, m.groups())
-        try:
-            return date(y, mth, d).strftime(output_fmt)
-        except ValueError:
-            return None
+    try:
+        return date(year, month, day).strftime(output_fmt)
+    except ValueError:
+        return None
+# --------------------------------------------------------
 
-    # YYYY/MM/DD
-    m = _YMD_SLASH_RE.match(s)
-    if m:
-        y, mth, d = map(int, m.groups())
-        try:
-            return date(y, mth, d).strftime(output_fmt)
-        except ValueError:
-            return None
+# Shared read-only stand-in for a missing nested object (no dict per row)
+EMPTY = MappingProxyType({})
 
-    return None
-# --------------------------------------------------------
+def _norm_iata(code: str | None) -> str:
+    return code.strip().upper() if code else ""
 
 def make_flight_name(item: dict) -> str:
-    airline = ((item.get("airline") or {}).get("name") or "Unknown").strip()
-    fl = item.get("flight") or {}
+    airline = ((item.get("airline") or EMPTY).get("name") or "Unknown").strip()
+    fl = item.get("flight") or EMPTY
     no = (fl.get("iata") or fl.get("number") or "").strip()
-    return (airline + (" " + no if no else "")).strip()
+    return f"{airline} {no}".strip() if no else airline
 
-def insert_from_json(cur: sqlite3.Cursor, item: dict) -> None:
-    dep = item.get("departure") or {}
-    arr = item.get("arrival") or {}
-    origin = (dep.get("iata") or "").strip().upper()
-    destination = (arr.get("iata") or "").strip().upper()
+INSERT_SQL = """INSERT OR IGNORE INTO flights
+   (flight_name, travel_date, origin, destination, departure_time, arrival_time,
+    departure_epoch, arrival_epoch)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
 
-    # date: prefer item.flight_date, else derive from departure.scheduled/estimated
-    date_raw = item.get("flight_date") or dep.get("scheduled") or dep.get("estimated")
-    travel_date = iso_date(date_raw)
+# Rows per executemany call: keeps the tuple list small for large feeds
+BATCH = 500
 
-    if not (origin and destination and travel_date):
-        return  # skip incomplete rows
+def epoch(ts: str | None) -> int | None:
+    """ISO8601 timestamp -> unix seconds; naive times are taken as UTC."""
+    if not ts:
+        return None
+    try:
+        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+def row_from_json(item: dict) -> tuple | None:
+    dep = item.get("departure") or EMPTY
+    arr = item.get("arrival") or EMPTY
+    origin = _norm_iata(dep.get("iata"))
+    destination = _norm_iata(arr.get("iata"))
+    if not (origin and destination):
+        return None  # skip incomplete rows
 
-    flight_name = make_flight_name(item)
     departure_time = dep.get("scheduled") or dep.get("estimated")
-    arrival_time = arr.get("scheduled") or arr.get("estimated")
+    # date: prefer item.flight_date, else derive from departure.scheduled/estimated
+    travel_date = iso_date(item.get("flight_date") or departure_time)
+    if not travel_date:
+        return None
 
-    cur.execute(
-        """INSERT OR IGNORE INTO flights
-           (flight_name, travel_date, origin, destination, departure_time, arrival_time)
-           VALUES (?, ?, ?, ?, ?, ?)""",
-        (flight_name, travel_date, origin, destination, departure_time, arrival_time),
+    arrival_time = arr.get("scheduled") or arr.get("estimated")
+    return (
+        make_flight_name(item), travel_date, origin, destination,
+        departure_time, arrival_time, epoch(departure_time), epoch(arrival_time),
     )
 
-def main():
-    if not Path(JSON_PATH).exists():
-        raise SystemExit(f"❌ No JSON found at {JSON_PATH}")
+def new_rows(items: list[dict], seen: set) -> Iterator[tuple]:
+    """
+    Yield the rows for `items`, minus repeats of a (flight_name, travel_date,
+    departure_time) key already in `seen` (updated in place), so duplicates
+    within the feed never reach the UNIQUE index. Rows without a departure
+    time are kept: SQLite treats NULLs as distinct, so they never conflicted.
+    Lazy, so executemany binds each row as it is built.
+    """
+    for r in filter(None, map(row_from_json, items)):
+        if r[4] is not None:
+            key = (r[0], r[1], r[4])
+            if key in seen:
+                continue
+            seen.add(key)
+        yield r
+
+def add_epoch_columns(conn: sqlite3.Connection) -> None:
+    """Add (and backfill) the epoch columns on an older flights table."""
+    have = {row[1] for row in conn.execute("PRAGMA table_info(flights)")}
+    for col, src in EPOCH_COLUMNS.items():
+        if col not in have:
+            conn.execute(f"ALTER TABLE flights ADD COLUMN {col} INTEGER")
+            conn.execute(
+                f"UPDATE flights SET {col} = CAST(strftime('%s', {src}) AS INTEGER) "
+                f"WHERE {src} IS NOT NULL"
+            )
 
-    with open(JSON_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f).get("data", [])
+def iter_flights(path: str) -> Iterator[dict]:
+    """Yield the items of the feed's "data" array."""
+    with open(path, "rb") as f:
+        if ijson is not None:
+            yield from ijson.items(f, "data.item")
+        else:
+            yield from _json_loads(f.read()).get("data") or ()
 
-    if not data:
+def main():
+    items = iter_flights(JSON_PATH)
+    try:
+        # the generator opens the file on this first pull
+        first = next(items, None)
+    except FileNotFoundError as e:
+        raise SystemExit(f"❌ No JSON found at {JSON_PATH}") from e
+    if first is None:
         print("ℹ️ No flights in JSON.")
         return
+    items = chain((first,), items)
 
     conn = sqlite3.connect(DB_PATH)
     try:
-        conn.executescript(SCHEMA)
-        cur = conn.cursor()
+        conn.executescript(PRAGMAS)
+        conn.executescript(CREATE_TABLE_SQL)
+        add_epoch_columns(conn)
         before = conn.total_changes
-        for item in data:
-            insert_from_json(cur, item)
+        total = 0
+        seen = set()
+        # executemany per BATCH rows as they are parsed, all in one transaction;
+        # OR IGNORE still covers rows already in the table from earlier runs
+        while batch := list(islice(items, BATCH)):
+            total += len(batch)
+            conn.executemany(INSERT_SQL, new_rows(batch, seen))
         conn.commit()
+        conn.executescript(CREATE_INDEXES_SQL)
         added = conn.total_changes - before
-        print(f"✅ Inserted {added}/{len(data)} flights into {DB_PATH} (duplicates ignored).")
+        print(f"✅ Inserted {added}/{total} flights into {DB_PATH} (duplicates ignored).")
     finally:
         conn.close()
 
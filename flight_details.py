@@ -7,31 +7,36 @@ params = {
     "limit": 1
 }
 
-resp = requests.get(url, params=params)
-print("Status Code:", resp.status_code)
+# Both ends of a flight carry an airport record
+PLACES = ("departure", "arrival")
 
-data = resp.json()
+# One Session so further pages would reuse the same keep-alive connection;
+# requests already asks for gzip/deflate and decodes it transparently
+with requests.Session() as session:
+    resp = session.get(url, params=params, timeout=10)
+print("Status Code:", resp.status_code)
 
-# Save full response (same as before)
-with open("flight_data.json", "w", encoding="utf-8") as f:
-    json.dump(data, f, indent=2, ensure_ascii=False)
+# Save the full response as received: the raw body, no re-encode pass
+with open("flight_data.json", "wb") as f:
+    f.write(resp.content)
 print("Response data saved to flight_data.json")
 
+data = resp.json()
+
 flights = data.get("data", [])
 
 # Dictionary of airports
 airports_dict = {}
 
 for flight in flights:
-    for place in ["departure", "arrival"]:
-        info = flight.get(place, {})
+    for place in PLACES:
+        info = flight.get(place) or {}
         airport = info.get("airport")
-        city = info.get("city") or airport  # fallback if city missing
         iata = info.get("iata")
 
-        if airport and city and iata:
+        if airport and iata:
             airports_dict[airport] = {
-                "city": city,
+                "city": info.get("city") or airport,  # fallback if city missing
                 "iata": iata
             }
 
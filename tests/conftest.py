@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# actions.actions opens its SQLite files at import; keep the tests off the
+# repo's bookings.db/flights.db
+_TMP = tempfile.mkdtemp(prefix="flight-bot-tests-")
+os.environ.setdefault("BOOKINGS_DB", os.path.join(_TMP, "bookings.db"))
+os.environ.setdefault("FLIGHTS_DB", os.path.join(_TMP, "flights.db"))
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
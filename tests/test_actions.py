@@ -0,0 +1,117 @@
+import pytest
+
+pytest.importorskip("rasa_sdk")
+
+from actions.actions import (  # noqa: E402
+    ValidateFlightBookingForm,
+    _load_pax,
+    _parse_pax_bulk,
+)
+
+
+class FakeTracker:
+    def __init__(self, **slots):
+        self.slots = slots
+
+    def get_slot(self, key):
+        return self.slots.get(key)
+
+
+class FakeDispatcher:
+    def __init__(self):
+        self.messages = []
+
+    def utter_message(self, text=None, **kwargs):
+        self.messages.append(text)
+
+
+ALICE = "Alice, +15551234567, alice@example.com, window"
+BOB = "Bob, 5559876543, bob@example.com, Aisle"
+CARA = "Cara, +447700900123, cara@example.com, middle"
+
+
+def validate_bulk(text, **slots):
+    dispatcher = FakeDispatcher()
+    entries = _parse_pax_bulk(text)
+    assert entries is not None
+    result = ValidateFlightBookingForm()._validate_pax_bulk(entries, dispatcher, FakeTracker(**slots))
+    return result, dispatcher.messages
+
+
+# --- _parse_pax_bulk ---
+
+def test_parse_splits_newline_semicolon_and_crlf():
+    expected = [
+        ["Alice", "+15551234567", "alice@example.com", "window"],
+        ["Bob", "5559876543", "bob@example.com", "Aisle"],
+        ["Cara", "+447700900123", "cara@example.com", "middle"],
+    ]
+    assert _parse_pax_bulk(f"{ALICE}\n{BOB}\n{CARA}") == expected
+    assert _parse_pax_bulk(f"{ALICE}; {BOB};{CARA}") == expected
+    assert _parse_pax_bulk(f"{ALICE}\r\n{BOB}\r\n{CARA}\r\n") == expected
+
+
+def test_parse_rejects_plain_names():
+    assert _parse_pax_bulk("Alice Smith") is None
+    # a name with commas is still a name, not a bulk answer
+    assert _parse_pax_bulk("Smith, John, Jr., III") is None
+    assert _parse_pax_bulk("Doe, Jane") is None
+
+
+def test_parse_rejects_wrong_field_count():
+    assert _parse_pax_bulk(f"{ALICE}\nBob, 5559876543, bob@example.com") is None
+
+
+# --- _validate_pax_bulk ---
+
+def test_bulk_fills_all_remaining_passengers():
+    result, messages = validate_bulk(f"{ALICE}\n{BOB}", current_passenger_index=1, expected_passengers=2)
+    assert messages == []
+    assert [p["name"] for p in _load_pax(result["passengers"])] == ["Alice", "Bob"]
+    assert result["current_passenger_index"] == 2
+    assert result["current_passenger_name"] == "Bob"
+    assert result["current_passenger_seat_preference"] == "aisle"
+
+
+def test_bulk_from_a_later_passenger_keeps_earlier_ones():
+    earlier = '[{"name": "Zed", "phone": "+15550000000", "email": "z@example.com", "seat": "aisle"}]'
+    result, messages = validate_bulk(
+        f"{BOB}\n{CARA}", current_passenger_index=2, expected_passengers=3, passengers=earlier
+    )
+    assert messages == []
+    assert [p["name"] for p in _load_pax(result["passengers"])] == ["Zed", "Bob", "Cara"]
+    assert result["current_passenger_index"] == 3
+    assert result["current_passenger_name"] == "Cara"
+
+
+def test_single_line_is_taken_as_the_current_passenger():
+    result, messages = validate_bulk(ALICE, current_passenger_index=1, expected_passengers=3)
+    assert [p["name"] for p in _load_pax(result["passengers"])] == ["Alice"]
+    assert result["current_passenger_index"] == 2
+    assert result["current_passenger_name"] is None
+    assert result["current_passenger_seat_preference"] is None
+    assert "passenger 2" in messages[-1]
+
+
+def test_too_many_passengers_is_rejected():
+    result, messages = validate_bulk(f"{ALICE}\n{BOB}\n{CARA}", current_passenger_index=2, expected_passengers=3)
+    assert result == {"current_passenger_name": None}
+    assert "at most 2 passenger(s)" in messages[-1]
+
+
+def test_invalid_seat_is_rejected():
+    result, messages = validate_bulk(
+        f"{ALICE}\nBob, 5559876543, bob@example.com, aisle seat please",
+        current_passenger_index=1,
+        expected_passengers=2,
+    )
+    assert result == {"current_passenger_name": None}
+    assert "Passenger 2" in messages[-1]
+
+
+def test_name_with_commas_goes_through_the_single_name_path():
+    form = ValidateFlightBookingForm()
+    result = form.validate_current_passenger_name(
+        "Smith, John, Jr., III", FakeDispatcher(), FakeTracker(current_passenger_index=1), {}
+    )
+    assert result == {"current_passenger_name": "Smith, John, Jr., III"}